@@ -17,6 +17,7 @@ MAX_GROUPS = 4
 
 # Color tuple.
 Color = namedtuple("Color", "R G B")
+RGB_WHITE = Color(255, 255, 255)
 
 
 class LimitlessLED(object):
@@ -1,11 +1,11 @@
 """ LimitlessLED Bridge. """
 
-import queue
 import socket
 import select
+import selectors
 import time
 import threading
-from datetime import datetime, timedelta
+from collections import deque
 
 from limitlessled import MIN_WAIT, REPS
 from limitlessled.group.rgbw import RgbwGroup, RGBW, BRIDGE_LED
@@ -20,16 +20,27 @@ BRIDGE_VERSION = 6
 BRIDGE_LED_GROUP = 1
 BRIDGE_LED_NAME = 'bridge'
 SELECT_WAIT = 0.025
-BRIDGE_INITIALIZATION_COMMAND = [0x20, 0x00, 0x00, 0x00, 0x16, 0x02, 0x62,
-                                 0x3a, 0xd5, 0xed, 0xa3, 0x01, 0xae, 0x08,
-                                 0x2d, 0x46, 0x61, 0x41, 0xa7, 0xf6, 0xdc,
-                                 0xaf, 0xfe, 0xf7, 0x00, 0x00, 0x1e]
-KEEP_ALIVE_COMMAND_PREAMBLE = [0xD0, 0x00, 0x00, 0x00, 0x02]
-KEEP_ALIVE_RESPONSE_PREAMBLE = [0xd8, 0x0, 0x0, 0x0, 0x07]
+BRIDGE_INITIALIZATION_COMMAND = bytes([0x20, 0x00, 0x00, 0x00, 0x16, 0x02, 0x62,
+                                       0x3a, 0xd5, 0xed, 0xa3, 0x01, 0xae, 0x08,
+                                       0x2d, 0x46, 0x61, 0x41, 0xa7, 0xf6, 0xdc,
+                                       0xaf, 0xfe, 0xf7, 0x00, 0x00, 0x1e])
+KEEP_ALIVE_COMMAND_PREAMBLE = bytes([0xD0, 0x00, 0x00, 0x00, 0x02])
+KEEP_ALIVE_RESPONSE_PREAMBLE = bytes([0xd8, 0x0, 0x0, 0x0, 0x07])
 KEEP_ALIVE_TIME = 5
 RECONNECT_TIME = 5
 SOCKET_TIMEOUT = 5
+SOCKET_BUFFER_SIZE = 1 << 20
+COMMAND_BATCH = 16
 STARTING_SEQUENTIAL_BYTE = 0x02
+# Group class and whether it takes the led type, per led type.
+GROUP_CLASSES = {
+    RGBW: (RgbwGroup, True),
+    BRIDGE_LED: (RgbwGroup, True),
+    RGBWW: (RgbwwGroup, False),
+    WHITE: (WhiteGroup, False),
+    DIMMER: (DimmerGroup, False),
+    WRGB: (WrgbGroup, False),
+}
 
 
 def group_factory(bridge, number, name, led_type):
@@ -41,18 +52,13 @@ def group_factory(bridge, number, name, led_type):
     :param led_type: Either `RGBW`, `WRGB`, `RGBWW`, `WHITE`, `DIMMER` or `BRIDGE_LED`.
     :returns: New group.
     """
-    if led_type in [RGBW, BRIDGE_LED]:
-        return RgbwGroup(bridge, number, name, led_type)
-    elif led_type == RGBWW:
-        return RgbwwGroup(bridge, number, name)
-    elif led_type == WHITE:
-        return WhiteGroup(bridge, number, name)
-    elif led_type == DIMMER:
-        return DimmerGroup(bridge, number, name)
-    elif led_type == WRGB:
-        return WrgbGroup(bridge, number, name)
-    else:
+    try:
+        cls, takes_led_type = GROUP_CLASSES[led_type]
+    except KeyError:
         raise ValueError('Invalid LED type: %s', led_type)
+    if takes_led_type:
+        return cls(bridge, number, name, led_type)
+    return cls(bridge, number, name)
 
 
 class Bridge(object):
@@ -81,18 +87,32 @@ class Bridge(object):
         self.ip = ip
         self.version = version
         self._sn = STARTING_SEQUENTIAL_BYTE
+        self._keep_alive_command = None
+        self._init_response = bytearray(22)
+        self._keep_alive_response = bytearray(12)
         self._socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-        self._socket.settimeout(SOCKET_TIMEOUT)
+        # Room for bursts of commands and responses, the system caps this.
+        self._socket.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF,
+                                SOCKET_BUFFER_SIZE)
+        self._socket.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF,
+                                SOCKET_BUFFER_SIZE)
         self._socket.connect((ip, port))
-        self._command_queue = queue.Queue()
-        self._lock = threading.Lock()
+        # UDP sends practically never block, skip the poll a timeout implies.
+        self._socket.setblocking(False)
+        self._command_queue = deque()
+        # Producers wake up the consumer through this socket pair.
+        self._wake_r, self._wake_w = socket.socketpair()
+        self._wake_r.setblocking(False)
+        self._wake_w.setblocking(False)
+        self._wake_pending = False
+        self._pacing = threading.local()
+        # Only taken when a pipeline starts or ends, readers go without.
+        # A bare += is a load, add and store, which threads can interleave.
+        self._active_lock = threading.Lock()
         self.active = 0
         self._selected_number = None
-
-        # Start queue consumer thread.
-        consumer = threading.Thread(target=self._consume)
-        consumer.daemon = True
-        consumer.start()
+        self._keep_alive_due = 0
+        self._keep_alive_deadline = None
 
         # Version specific stuff
         self._wb1 = None
@@ -109,10 +129,10 @@ class Bridge(object):
             # Initialize connection to retrieve bridge session ids (wb1, wb2)
             self._init_connection()
 
-            # Start keep alive thread.
-            keep_alive_thread = threading.Thread(target=self._keep_alive)
-            keep_alive_thread.daemon = True
-            keep_alive_thread.start()
+        # Start the thread that consumes the queue and keeps the bridge alive.
+        consumer = threading.Thread(target=self._consume)
+        consumer.daemon = True
+        consumer.start()
 
     @property
     def sn(self):
@@ -136,12 +156,12 @@ class Bridge(object):
 
     def incr_active(self):
         """ Increment number of active groups. """
-        with self._lock:
+        with self._active_lock:
             self.active += 1
 
     def decr_active(self):
         """ Decrement number of active groups. """
-        with self._lock:
+        with self._active_lock:
             self.active -= 1
 
     def add_group(self, number, name, led_type):
@@ -163,148 +183,335 @@ class Bridge(object):
         :param reps: Number of repetitions.
         :param wait: Wait time in seconds.
         """
-        # Enqueue the command.
-        self._command_queue.put((command, reps, wait))
-        # Wait before accepting another command.
+        # Wait until the previous command of this thread had its time.
         # This keeps individual groups relatively synchronized.
-        sleep = reps * wait * self.active
-        if command.select and self._selected_number != command.group_number:
-            sleep += SELECT_WAIT
-        time.sleep(sleep)
+        now = time.monotonic()
+        next_send = getattr(self._pacing, 'next_send', 0.0)
+        if next_send > now:
+            time.sleep(next_send - now)
+        else:
+            next_send = now
+        # Only throttle when other commands compete for the bridge.
+        contended = bool(self._command_queue) or self.active > 1
+        # Enqueue the command.
+        self._enqueue((command, reps, wait))
+        if not contended:
+            self._pacing.next_send = 0.0
+            return
+        # Work done by the caller until its next command counts
+        # towards the wait for this one. Pace from the slot this command
+        # was due in, so oversleeping does not add up over a transition.
+        pacing = reps * wait * self.active
+        if command.select_group not in (None, self._selected_number):
+            pacing += SELECT_WAIT
+        self._pacing.next_send = next_send + pacing
 
     def _consume(self):
         """ Consume commands from the queue.
 
         The command is repeated according to the configured value.
-        Wait after each command is sent.
+        Wait after each command is sent. In between commands,
+        keep alive messages are sent to bridges that need them.
 
-        The bridge socket is a shared resource. It must only
-        be used by one thread at a time. Note that this can and
-        will delay commands if multiple groups are attempting
-        to communicate at the same time on the same bridge.
+        The bridge socket is only used by this thread. Note that
+        this can and will delay commands if multiple groups are
+        attempting to communicate at the same time on the same bridge.
         """
-        while not self.is_closed:
+        selector = selectors.DefaultSelector()
+        selector.register(self._wake_r, selectors.EVENT_READ)
+        if self.version >= 6:
+            selector.register(self._socket, selectors.EVENT_READ)
+        # Bound once, the loop runs for every batch of commands.
+        select_events = selector.select
+        command_queue = self._command_queue
+        wake_r = self._wake_r
+        keep_alive = self.version >= 6
+        try:
+            while not self.is_closed:
+                if keep_alive and not self.is_ready:
+                    self._reconnect()
+                    continue
+
+                # Handle wake ups and bridge responses. Only block
+                # if there is nothing to send.
+                if command_queue:
+                    timeout = 0
+                elif keep_alive:
+                    timeout = self._keep_alive_timeout()
+                else:
+                    timeout = None
+                for key, _ in select_events(timeout):
+                    if key.fileobj is wake_r:
+                        self._drain_wake()
+                    else:
+                        self._receive()
+
+                if keep_alive:
+                    self._keep_alive()
+                    if not self.is_ready:
+                        continue
+
+                if not self._process_batch():
+                    break
+        finally:
+            selector.close()
+            self._wake_r.close()
+            self._wake_w.close()
+
+    def _process_batch(self):
+        """ Send the queued commands, up to COMMAND_BATCH at a time.
+
+        The batch ends early when the bridge needs attention,
+        so responses and keep alive messages are not held up.
+
+        :returns: False if the bridge was closed, True otherwise.
+        """
+        popleft = self._command_queue.popleft
+        process = self._process
+        keep_alive = self.version >= 6
+        monotonic = time.monotonic
+        for _ in range(COMMAND_BATCH):
             # Get command from queue.
-            msg = self._command_queue.get()
+            try:
+                msg = popleft()
+            except IndexError:
+                break
 
             # Closed
             if msg is None:
+                return False
+
+            process(msg)
+            if not self.is_ready or (keep_alive and
+                                     monotonic() >= self._keep_alive_due):
+                break
+        return True
+
+    def _process(self, msg):
+        """ Send a command from the queue to the bridge.
+
+        :param msg: Command, repetitions and wait time.
+        """
+        (command, reps, wait) = msg
+
+        # Select group if a different group is currently selected.
+        select_group = command.select_group
+        if select_group is not None and \
+                select_group != self._selected_number:
+            select_command = command.select_command
+            if self._send_raw(select_command.get_bytes(self),
+                              select_command.SN_INDEX):
+                self._selected_number = select_group
+                time.sleep(SELECT_WAIT)
+            else:
+                # Stop sending on socket error
+                self.is_ready = False
+
+        # Repeat command as necessary.
+        if self.is_ready and self._send_raw_batch(command, reps, wait) < reps:
+            # Stop sending on socket error
+            self.is_ready = False
+
+        # For older bridges, always try again, there's no keep-alive
+        if not self.is_ready and self.version < 6:
+            # Give the reconnect some time
+            self._sleep(RECONNECT_TIME)
+            self.is_ready = True
+
+    def _enqueue(self, msg):
+        """
+        Put a message on the command queue and wake up the consumer.
+        :param msg: Message for the consumer.
+        """
+        self._command_queue.append(msg)
+        # One pending wake up is enough, the consumer
+        # checks the queue again after draining it.
+        if self._wake_pending:
+            return
+        self._wake_pending = True
+        try:
+            self._wake_w.send(b'\x01')
+        except OSError:
+            # A full buffer already holds a pending wake up,
+            # a closed one means the consumer is gone.
+            pass
+
+    def _sleep(self, duration):
+        """
+        Sleep, but wake up as soon as the bridge is closed.
+        :param duration: Time to sleep in seconds.
+        """
+        deadline = time.monotonic() + duration
+        while not self.is_closed:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
                 return
+            select.select([self._wake_r], [], [], remaining)
+            self._drain_wake()
 
-            # Use the lock so we are sure is_ready is not changed during execution
-            # and the socket is not in use
-            with self._lock:
-                # Check if bridge is ready
-                if self.is_ready:
-                    (command, reps, wait) = msg
-
-                    # Select group if a different group is currently selected.
-                    if command.select and self._selected_number != command.group_number:
-                        if self._send_raw(command.select_command.get_bytes(self)):
-                            self._selected_number = command.group_number
-                            time.sleep(SELECT_WAIT)
-                        else:
-                            # Stop sending on socket error
-                            self.is_ready = False
-
-                    # Repeat command as necessary.
-                    for _ in range(reps):
-                        if self.is_ready:
-                            if self._send_raw(command.get_bytes(self)):
-                                time.sleep(wait)
-                            else:
-                                # Stop sending on socket error
-                                self.is_ready = False
-
-            # Wait if bridge is not ready, we're only reading is_ready, no lock needed
-            if not self.is_ready and not self.is_closed:
-                # For older bridges, always try again, there's no keep-alive thread
-                if self.version < 6:
-                    # Give the reconnect some time
-                    time.sleep(RECONNECT_TIME)
-                    self.is_ready = True
-
-    def _send_raw(self, command):
+    def _drain_wake(self):
+        """
+        Discard pending wake up bytes.
+        """
+        try:
+            while self._wake_r.recv(64):
+                pass
+        except OSError:
+            pass
+        # Only clear once the bytes are gone. A producer that still sees
+        # the flag set does not write, but its command is already queued
+        # and the queue is checked again after draining.
+        self._wake_pending = False
+
+    def _send_raw(self, command, sn_index=None):
         """
         Sends an raw command directly to the physical bridge.
-        :param command: A bytearray.
+        :param command: A bytes-like object.
+        :param sn_index: Position to stamp the current sequential byte at.
+        """
+        if sn_index is not None:
+            command[sn_index] = self._sn
+        if not self._send_datagram(command):
+            return False
+        self._sn = (self._sn + 1) & 0xFF
+        return True
+
+    def _send_datagram(self, data):
+        """
+        Sends a datagram to the physical bridge.
+        :param data: A bytes-like object.
+        :returns: True, if the datagram was sent. False, otherwise.
         """
         try:
-            self._socket.send(bytearray(command))
-            self._sn = (self._sn + 1) % 256
+            try:
+                self._socket.send(data)
+            except BlockingIOError:
+                # The send buffer is full, give it some time to drain.
+                select.select([], [self._socket], [], SOCKET_TIMEOUT)
+                self._socket.send(data)
             return True
         except (socket.error, socket.timeout):
             # We can get a socket.error or timeout exception if the bridge is disconnected,
             # but we are still sending data. In that case, return False to indicate that data is not sent.
             return False
 
+    def _send_raw_batch(self, command, reps, wait=0):
+        """
+        Sends a command to the physical bridge several times in a row.
+        :param command: A Command instance.
+        :param reps: Number of repetitions.
+        :param wait: Wait time in seconds after each repetition.
+        :returns: Number of repetitions sent.
+        """
+        # Serialize once, only the sequence byte differs between repetitions.
+        cmd_bytes = command.get_bytes(self)
+        sn_index = command.SN_INDEX
+        send = self._send_datagram
+        # Only this thread sends, keep the sequential byte local meanwhile.
+        sn = self._sn
+        try:
+            for sent in range(reps):
+                if sn_index is not None:
+                    cmd_bytes[sn_index] = sn
+                if not send(cmd_bytes):
+                    return sent
+                sn = (sn + 1) & 0xFF
+                if wait:
+                    time.sleep(wait)
+            return reps
+        finally:
+            self._sn = sn
+
     def _init_connection(self):
         """
         Requests the session ids of the bridge.
         :returns: True, if initialization was successful. False, otherwise.
         """
+        response = self._init_response
+        ready = False
         try:
-            # We are changing self.is_ready: lock it up!
-            self._lock.acquire()
-
-            response = bytearray(22)
             self._send_raw(BRIDGE_INITIALIZATION_COMMAND)
-            self._socket.recv_into(response)
+            # Skip anything else the bridge still had to say.
+            deadline = time.monotonic() + SOCKET_TIMEOUT
+            while not ready:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or \
+                        not select.select([self._socket], [], [], remaining)[0]:
+                    break
+                # The buffer is reused, only trust what was received.
+                ready = self._socket.recv_into(response) > 20
+        except (socket.error, socket.timeout):
+            # Connection refused, bridge is not ready for us
+            pass
+
+        if ready:
             self._wb1 = response[19]
             self._wb2 = response[20]
-            self.is_ready = True
-        except (socket.error, socket.timeout):
-            # Connection timed out, bridge is not ready for us
-            self.is_ready = False
-        finally:
-            # Prevent deadlocks: always release the lock
-            self._lock.release()
+            self._keep_alive_command = KEEP_ALIVE_COMMAND_PREAMBLE + \
+                bytes([self._wb1, self._wb2])
+            # Start over with the keep alive messages.
+            self._keep_alive_due = 0
+            self._keep_alive_deadline = None
+        self.is_ready = ready
 
-        return self.is_ready
+        return ready
 
     def _reconnect(self):
         """
         Try continuously to reconnect to the bridge.
         """
         while not self.is_closed:
+            # Commands are dropped while the bridge is not ready, as are
+            # stale responses that would get in the way of the new session.
+            self._command_queue.clear()
+            self._receive()
             if self._init_connection():
                 return
 
-            time.sleep(RECONNECT_TIME)
+            self._sleep(RECONNECT_TIME)
+
+    def _keep_alive_timeout(self):
+        """
+        Time until the keep alive messages need attention again.
+        :returns: Timeout in seconds.
+        """
+        if self._keep_alive_deadline is not None:
+            return self._keep_alive_deadline - time.monotonic()
+        return self._keep_alive_due - time.monotonic()
 
     def _keep_alive(self):
         """
-        Send keep alive messages continuously to bridge.
+        Send a keep alive message to the bridge when it is due.
+        The bridge is not ready anymore if it did not respond in time.
         """
-        send_next_keep_alive_at = 0
-        while not self.is_closed:
-            if not self.is_ready:
-                self._reconnect()
-                continue
-
-            if time.monotonic() > send_next_keep_alive_at:
-                command = KEEP_ALIVE_COMMAND_PREAMBLE + [self.wb1, self.wb2]
-                self._send_raw(command)
-                need_response_by = time.monotonic() + KEEP_ALIVE_TIME
-
-            # Wait for responses
-            timeout = max(0, need_response_by - time.monotonic())
-            ready = select.select([self._socket], [], [], timeout)
-            if ready[0]:
-                try:
-                    response = bytearray(12)
-                    self._socket.recv_into(response)
-
-                    if response[:5] == bytearray(KEEP_ALIVE_RESPONSE_PREAMBLE):
-                        send_next_keep_alive_at = need_response_by
-                except (socket.error, socket.timeout):
-                    with self._lock:
-                        self.is_ready = False
-            elif send_next_keep_alive_at < need_response_by:
-                # Acquire the lock to make sure we don't change self.is_ready
-                # while _consume() is sending commands
-                with self._lock:
-                    self.is_ready = False
+        now = time.monotonic()
+        if self._keep_alive_deadline is not None:
+            if now > self._keep_alive_deadline:
+                self.is_ready = False
+        elif now >= self._keep_alive_due:
+            # Keep alive messages carry no sequential byte.
+            self._send_datagram(self._keep_alive_command)
+            self._keep_alive_due = now + KEEP_ALIVE_TIME
+            self._keep_alive_deadline = now + KEEP_ALIVE_TIME
+
+    def _receive(self):
+        """
+        Read all pending responses from the bridge.
+        """
+        response = self._keep_alive_response
+        while True:
+            try:
+                received = self._socket.recv_into(response)
+            except BlockingIOError:
+                return
+            except (socket.error, socket.timeout):
+                self.is_ready = False
+                return
+
+            # The buffer is reused, only trust what was received.
+            if received >= len(KEEP_ALIVE_RESPONSE_PREAMBLE) and \
+                    response.startswith(KEEP_ALIVE_RESPONSE_PREAMBLE):
+                self._keep_alive_deadline = None
 
     def close(self):
         """
@@ -312,4 +519,4 @@ class Bridge(object):
         """
         self.is_closed = True
         self.is_ready = False
-        self._command_queue.put(None)
+        self._enqueue(None)
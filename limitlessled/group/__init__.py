@@ -1,9 +1,9 @@
 """ LimitlessLED groups. """
 
-import math
 import time
 import threading
-import queue
+from collections import deque
+from functools import wraps
 
 from limitlessled import MIN_WAIT, REPS
 from limitlessled.pipeline import Pipeline, PipelineQueue
@@ -22,6 +22,7 @@ def rate(wait=MIN_WAIT, reps=REPS):
 
         :returns: Wrapper.
         """
+        @wraps(function)
         def wrapper(self, *args, **kwargs):
             """ Wrapper.
 
@@ -32,9 +33,11 @@ def rate(wait=MIN_WAIT, reps=REPS):
             saved_reps = self.reps
             self.wait = wait
             self.reps = reps
-            function(self, *args, **kwargs)
-            self.wait = saved_wait
-            self.reps = saved_reps
+            try:
+                return function(self, *args, **kwargs)
+            finally:
+                self.wait = saved_wait
+                self.reps = saved_reps
         return wrapper
     return decorator
 
@@ -57,9 +60,10 @@ class Group(object):
         self._command_set = command_set_factory(bridge, number, led_type)
         self._on = False
         self._brightness = 0.5
-        self._queue = queue.Queue()
+        self._queue = deque()
+        self._queued = threading.Event()
         self._event = threading.Event()
-        self._thread = PipelineQueue(self._queue, self._event)
+        self._thread = PipelineQueue(self._queue, self._event, self._queued)
         self._thread.daemon = True
         self._thread.start()
         self.wait = MIN_WAIT
@@ -80,9 +84,10 @@ class Group(object):
         :param state: True (on) or False (off).
         """
         self._on = state
-        cmd = self.command_set.off()
         if state:
             cmd = self.command_set.on()
+        else:
+            cmd = self.command_set.off()
         self.send(cmd)
 
     def link(self):
@@ -128,7 +133,8 @@ class Group(object):
         """
         copied = Pipeline().append(pipeline)
         copied.group = self
-        self._queue.put(copied)
+        self._queue.append(copied)
+        self._queued.set()
 
     def stop(self):
         """ Stop a running pipeline. """
@@ -142,8 +148,9 @@ class Group(object):
         :param commands: Number of commands.
         :returns: Wait in seconds.
         """
-        wait = ((duration - self.wait * self.reps * commands) / steps) - \
-               (self.wait * self.reps * self._bridge.active)
+        command_time = self.wait * self.reps
+        wait = ((duration - command_time * commands) / steps) - \
+               (command_time * self._bridge.active)
         return max(0, wait)
 
     def _scale_steps(self, duration, commands, *steps):
@@ -154,14 +161,43 @@ class Group(object):
         :param steps: Steps for one or many properties to take.
         :return: Steps scaled to time and total.
         """
-        factor = duration / ((self.wait * self.reps * commands) - \
-                 (self.wait * self.reps * self._bridge.active))
-        steps = [math.ceil(factor * step) for step in steps]
+        # Ceiling division in whole microseconds, exact unlike floats.
+        duration_us = round(duration * 1000000)
+        command_us = round(self.wait * self.reps * 1000000)
+        span_us = (command_us * commands) - (command_us * self._bridge.active)
+        steps = [-(-duration_us * step // span_us) for step in steps]
         if len(steps) == 1:
             return steps[0]
         else:
             return steps
 
+    @staticmethod
+    def _wait_for_step(start, step, period):
+        """ Wait until the next transition step is due.
+
+        Steps are timed from the start of the transition,
+        so time spent sending commands does not add up.
+
+        :param start: Start of the transition (monotonic time).
+        :param step: Index of the step just performed.
+        :param period: Time per step (in seconds).
+        """
+        delay = start + (step + 1) * period - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+
+    def _step_to(self, attr, value):
+        """ Set a property to the value of a transition step.
+
+        Steps are rounded, so neighbouring steps can repeat a
+        value. A repeated value needs no command.
+
+        :param attr: Name of the property.
+        :param value: Value of the step.
+        """
+        if getattr(self, attr) != value:
+            setattr(self, attr, value)
+
     def __str__(self):
         """ String representation.
 
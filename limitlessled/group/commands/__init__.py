@@ -2,6 +2,11 @@
 import binascii
 
 
+# Command set class per (bridge version, led type). Filled on first use,
+# since the command set modules import this one.
+_COMMAND_SETS = {}
+
+
 def command_set_factory(bridge, group_number, led_type):
     """
     Create command set for controlling a specific led group.
@@ -10,6 +15,20 @@ def command_set_factory(bridge, group_number, led_type):
     :param led_type: The type of the leds.
     :return: The created command set.
     """
+    if not _COMMAND_SETS:
+        _load_command_sets()
+    try:
+        cls = _COMMAND_SETS[(bridge.version, led_type)]
+    except KeyError:
+        raise ValueError('There is no command set for '
+                         'specified bridge version and led type.')
+    return cls(group_number)
+
+
+def _load_command_sets():
+    """
+    Index the command sets by supported bridge version and led type.
+    """
     from limitlessled.group.commands.legacy import (
         CommandSetWhiteLegacy, CommandSetRgbwLegacy)
     from limitlessled.group.commands.v6 import (
@@ -21,19 +40,25 @@ def command_set_factory(bridge, group_number, led_type):
                     CommandSetBridgeLightV6, CommandSetWhiteV6,
                     CommandSetDimmerV6, CommandSetRgbwV6,
                     CommandSetRgbwwV6, CommandSetWrgbV6]
-    try:
-        cls = next(cs for cs in command_sets if
-                   bridge.version in cs.SUPPORTED_VERSIONS and
-                   led_type in cs.SUPPORTED_LED_TYPES)
-        return cls(group_number)
-    except StopIteration:
-        raise ValueError('There is no command set for '
-                         'specified bridge version and led type.')
+    # Earlier command sets win, as with a scan through the list.
+    table = {}
+    for cls in reversed(command_sets):
+        for version in cls.SUPPORTED_VERSIONS:
+            for led_type in cls.SUPPORTED_LED_TYPES:
+                table[(version, led_type)] = cls
+    # Publish all at once, other threads may be looking already.
+    _COMMAND_SETS.update(table)
 
 
 class Command:
     """ Base class for a single command to be sent to the bridge. """
 
+    # Position of the bridge sequence byte in the command bytes, if any.
+    SN_INDEX = None
+
+    __slots__ = ('_cmd_1', '_cmd_2', '_group_number',
+                 '_select', '_select_command', 'select_group')
+
     def __init__(self, cmd_1, cmd_2, group_number,
                  select=False, select_command=None):
         """
@@ -49,6 +74,8 @@ class Command:
         self._group_number = group_number
         self._select = select
         self._select_command = select_command
+        # Group that has to be selected first, if any.
+        self.select_group = group_number if select else None
 
     @property
     def cmd_1(self):
@@ -96,6 +123,9 @@ class Command:
 class CommandSet:
     """ Base class for command sets."""
 
+    __slots__ = ('_group_number', '_brightness_steps', '_hue_steps',
+                 '_saturation_steps', '_temperature_steps', '_commands')
+
     def __init__(self, group_number,
                  brightness_steps, hue_steps=1,
                  saturation_steps=1, temperature_steps=1):
@@ -112,6 +142,9 @@ class CommandSet:
         self._hue_steps = hue_steps
         self._saturation_steps = saturation_steps
         self._temperature_steps = temperature_steps
+        # Built commands by their arguments. Commands are not changed
+        # after construction, so the same one can be handed out again.
+        self._commands = {}
 
     @property
     def brightness_steps(self):
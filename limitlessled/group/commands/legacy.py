@@ -1,6 +1,6 @@
 """ Command sets for wifi bridge version 5 and lower. """
 
-import math
+from math import ceil
 
 from limitlessled.group.rgbw import RGBW
 from limitlessled.group.white import WHITE
@@ -14,6 +14,8 @@ class CommandLegacy(Command):
     BRIDGE_SHORT_VERSION_MIN = 3
     BRIDGE_LONG_BYTE = 0x55
 
+    __slots__ = ('_bytes', '_long_bytes')
+
     def __init__(self, cmd_1, cmd_2, group_number,
                  select=False, select_command=None):
         """
@@ -25,21 +27,21 @@ class CommandLegacy(Command):
         :param select_command: Selection command bytes.
         """
         super().__init__(cmd_1, cmd_2, group_number, select, select_command)
+        if self.cmd_2 is not None:
+            self._bytes = bytes([self.cmd_1, self.cmd_2])
+        else:
+            self._bytes = bytes([self.cmd_1, self.SUFFIX_BYTE])
+        self._long_bytes = self._bytes + bytes([self.BRIDGE_LONG_BYTE])
 
     def get_bytes(self, bridge):
         """
         Gets the full command as bytes.
         :param bridge: The bridge, to which the command should be sent.
         """
-        if self.cmd_2 is not None:
-            cmd = [self.cmd_1, self.cmd_2]
-        else:
-            cmd = [self.cmd_1, self.SUFFIX_BYTE]
-
         if bridge.version < self.BRIDGE_SHORT_VERSION_MIN:
-            cmd.append(self.BRIDGE_LONG_BYTE)
+            return self._long_bytes
 
-        return bytearray(cmd)
+        return self._bytes
 
 
 class CommandSetLegacy(CommandSet):
@@ -48,6 +50,8 @@ class CommandSetLegacy(CommandSet):
     SUPPORTED_VERSIONS = [1, 2, 3, 4, 5]
     BRIGHTNESS_OFFSET = 2
 
+    __slots__ = ()
+
     def convert_brightness(self, brightness):
         """
         Convert the brightness from decimal percent (0.0-1.0)
@@ -55,7 +59,7 @@ class CommandSetLegacy(CommandSet):
         :param brightness: The brightness from in decimal percent (0.0-1.0).
         :return: The brightness in byte representation.
         """
-        brightness = math.ceil(brightness * self.brightness_steps)
+        brightness = ceil(brightness * self.brightness_steps)
         return brightness + self.BRIGHTNESS_OFFSET
 
     @staticmethod
@@ -65,9 +69,10 @@ class CommandSetLegacy(CommandSet):
         :param hue: The hue in decimal percent (0.0-1.0).
         :return: The hue regarding the LimitlessLED color wheel.
         """
-        hue = hue * -1 + 1 + (2.0/3.0)  # RGB -> BGR
+        hue = 1 - hue + (2.0/3.0)  # RGB -> BGR
 
-        return int(math.floor((hue % 1) * 256))
+        # The modulo is never negative, so int() floors.
+        return int((hue % 1) * 256)
 
     def _build_command(self, cmd_1, cmd_2=None,
                        select=False, select_command=None):
@@ -79,21 +84,30 @@ class CommandSetLegacy(CommandSet):
         :param select_command: Selection command bytes.
         :return: The complete command.
         """
-
-        return CommandLegacy(cmd_1, cmd_2,
-                             self._group_number, select, select_command)
+        # The cached command keeps its select command, and so its id, alive.
+        commands = self._commands
+        key = (cmd_1, cmd_2, select, id(select_command))
+        command = commands.get(key)
+        if command is None:
+            command = CommandLegacy(cmd_1, cmd_2, self._group_number,
+                                    select, select_command)
+            commands[key] = command
+        return command
 
 
 class CommandSetWhiteLegacy(CommandSetLegacy):
     """ Command set for white led light connected to legacy wifi bridge. """
 
     SUPPORTED_LED_TYPES = [WHITE]
-    ON_BYTES = [0x38, 0x3D, 0x37, 0x32]
-    OFF_BYTES = [0x3B, 0x33, 0x3A, 0x36]
-    NIGHT_BYTES = [0xBB, 0xB3, 0xBA, 0xB6]
+    ON_BYTES = bytes([0x38, 0x3D, 0x37, 0x32])
+    OFF_BYTES = bytes([0x3B, 0x33, 0x3A, 0x36])
+    NIGHT_BYTES = bytes([0xBB, 0xB3, 0xBA, 0xB6])
     BRIGHTNESS_STEPS = 10
     TEMPERATURE_STEPS = 10
 
+    __slots__ = ('_on', '_off', '_night_light', '_dimmer', '_brighter',
+                 '_cooler', '_warmer')
+
     def __init__(self, group_number):
         """
         Initializes the command set.
@@ -101,56 +115,70 @@ class CommandSetWhiteLegacy(CommandSetLegacy):
         """
         super().__init__(group_number, self.BRIGHTNESS_STEPS,
                          temperature_steps=self.TEMPERATURE_STEPS)
+        # None of the commands take a value, build them once.
+        index = group_number - 1
+        self._on = self._build_command(self.ON_BYTES[index])
+        self._off = self._build_command(self.OFF_BYTES[index])
+        self._night_light = self._build_command(self.NIGHT_BYTES[index],
+                                                select=True,
+                                                select_command=self._off)
+        self._dimmer = self._build_command(0x34, select=True,
+                                           select_command=self._on)
+        self._brighter = self._build_command(0x3C, select=True,
+                                             select_command=self._on)
+        self._cooler = self._build_command(0x3F, select=True,
+                                           select_command=self._on)
+        self._warmer = self._build_command(0x3E, select=True,
+                                           select_command=self._on)
 
     def on(self):
         """
         Build command for turning the led on.
         :return: The command.
         """
-        return self._build_command(self.ON_BYTES[self._group_number - 1])
+        return self._on
 
     def off(self):
         """
         Build command for turning the led off.
         :return: The command.
         """
-        return self._build_command(self.OFF_BYTES[self._group_number - 1])
+        return self._off
 
     def night_light(self):
         """
         Build command for turning the led to night light mode.
         :return: The command.
         """
-        return self._build_command(self.NIGHT_BYTES[self._group_number - 1],
-                                   select=True, select_command=self.off())
+        return self._night_light
 
     def dimmer(self):
         """
         Build command for setting the brightness one step dimmer.
         :return: The command.
         """
-        return self._build_command(0x34, select=True, select_command=self.on())
+        return self._dimmer
 
     def brighter(self):
         """
         Build command for setting the brightness one step brighter.
         :return: The command.
         """
-        return self._build_command(0x3C, select=True, select_command=self.on())
+        return self._brighter
 
     def cooler(self):
         """
         Build command for setting the temperature one step cooler.
         :return: The command.
         """
-        return self._build_command(0x3F, select=True, select_command=self.on())
+        return self._cooler
 
     def warmer(self):
         """
         Build command for setting the temperature one step warmer.
         :return: The command.
         """
-        return self._build_command(0x3E, select=True, select_command=self.on())
+        return self._warmer
 
 
 class CommandSetRgbwLegacy(CommandSetLegacy):
@@ -160,6 +188,8 @@ class CommandSetRgbwLegacy(CommandSetLegacy):
     HUE_STEPS = 255
     BRIGHTNESS_STEPS = 25
 
+    __slots__ = ('_on', '_off', '_night_light', '_white')
+
     def __init__(self, group_number):
         """
         Initializes the command set.
@@ -167,36 +197,45 @@ class CommandSetRgbwLegacy(CommandSetLegacy):
         """
         super().__init__(group_number, self.BRIGHTNESS_STEPS,
                          hue_steps=self.HUE_STEPS)
+        # Build the commands that do not take a value once.
+        # Their bytes are two apart per group.
+        offset = (group_number - 1) * 2
+        self._on = self._build_command(0x45 + offset)
+        self._off = self._build_command(0x46 + offset)
+        self._night_light = self._build_command(0xC6 + offset,
+                                                select=True,
+                                                select_command=self._off)
+        self._white = self._build_command(0xC5 + offset,
+                                          select=True,
+                                          select_command=self._on)
 
     def on(self):
         """
         Build command for turning the led on.
         :return: The command.
         """
-        return self._build_command(self._offset(0x45))
+        return self._on
 
     def off(self):
         """
         Build command for turning the led off.
         :return: The command.
         """
-        return self._build_command(self._offset(0x46))
+        return self._off
 
     def night_light(self):
         """
         Build command for turning the led to night light mode.
         :return: The command.
         """
-        return self._build_command(self._offset(0xC6),
-                                   select=True, select_command=self.off())
+        return self._night_light
 
     def white(self):
         """
         Build command for turning the led into white mode.
         :return: The command.
         """
-        return self._build_command(self._offset(0xC5),
-                                   select=True, select_command=self.on())
+        return self._white
 
     def hue(self, hue):
         """
@@ -205,7 +244,7 @@ class CommandSetRgbwLegacy(CommandSetLegacy):
         :return: The command.
         """
         return self._build_command(0x40, self.convert_hue(hue),
-                                   select=True, select_command=self.on())
+                                   select=True, select_command=self._on)
 
     def brightness(self, brightness):
         """
@@ -214,13 +253,4 @@ class CommandSetRgbwLegacy(CommandSetLegacy):
         :return: The command.
         """
         return self._build_command(0x4E, self.convert_brightness(brightness),
-                                   select=True, select_command=self.on())
-
-    def _offset(self, byte):
-        """ Calcuate group command offset.
-
-        :param byte: Base byte.
-        :returns: Appropriate byte for group.
-        """
-        index = self._group_number - 1
-        return byte + (index * 2)
+                                   select=True, select_command=self._on)
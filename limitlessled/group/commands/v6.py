@@ -1,7 +1,8 @@
 """ Command sets for wifi bridge version 6. """
 
 
-import math
+from math import ceil
+import struct
 
 from limitlessled.group.rgbw import RGBW, BRIDGE_LED
 from limitlessled.group.rgbww import RGBWW
@@ -21,6 +22,17 @@ class CommandV6(Command):
     TYPE_LINK = 0x3D
     TYPE_UNLINK = 0x3E
 
+    SN_INDEX = 8
+    WB1_INDEX = 5
+    WB2_INDEX = 6
+
+    PREAMBLE = bytes([0x80, 0x00, 0x00, 0x00, 0x11, 0x00, 0x00, 0x00, 0x00,
+                      0x00])
+    # Command, zone selector and checksum.
+    BODY = struct.Struct('9B2BB')
+
+    __slots__ = ('_remote_style', 'type', '_template')
+
     def __init__(self, cmd_1, cmd_2, remote_style, group_number,
                  select=False, select_command=None, command_type=0x31):
         """
@@ -37,6 +49,18 @@ class CommandV6(Command):
         self._remote_style = remote_style
         self.type = command_type
 
+        # Only the session and sequence bytes depend on the bridge, so
+        # everything else (including the checksum) is built once.
+        # The checksum covers the command and the zone selector; cmd_2 is
+        # repeated four times and the zone selector ends in a zero byte.
+        checksum = (command_type + self.PASSWORD_BYTE1 +
+                    self.PASSWORD_BYTE2 + remote_style + cmd_1 +
+                    4 * cmd_2 + group_number) & 0xFF
+        self._template = self.PREAMBLE + self.BODY.pack(
+            command_type, self.PASSWORD_BYTE1, self.PASSWORD_BYTE2,
+            remote_style, cmd_1, cmd_2, cmd_2, cmd_2, cmd_2,
+            group_number, 0x00, checksum)
+
     def get_bytes(self, bridge):
         """
         Gets the full command as bytes.
@@ -45,18 +69,11 @@ class CommandV6(Command):
         if not bridge.is_ready:
             raise Exception('The bridge has to be ready to construct command.')
 
-        wb1 = bridge.wb1
-        wb2 = bridge.wb2
-        sn = bridge.sn
-
-        preamble = [0x80, 0x00, 0x00, 0x00, 0x11, wb1, wb2, 0x00, sn, 0x00]
-        cmd = [self.type, self.PASSWORD_BYTE1, self.PASSWORD_BYTE2,
-               self._remote_style, self._cmd_1,
-               self._cmd_2, self._cmd_2, self._cmd_2, self._cmd_2]
-        zone_selector = [self._group_number, 0x00]
-        checksum = sum(cmd + zone_selector) & 0xFF
-
-        return bytearray(preamble + cmd + zone_selector + [checksum])
+        packet = bytearray(self._template)
+        packet[self.WB1_INDEX] = bridge.wb1
+        packet[self.WB2_INDEX] = bridge.wb2
+        packet[self.SN_INDEX] = bridge.sn
+        return packet
 
 
 class CommandSetV6(CommandSet):
@@ -68,6 +85,8 @@ class CommandSetV6(CommandSet):
     MAX_BRIGHTNESS = 0x64
     MAX_TEMPERATURE = 0x64
 
+    __slots__ = ('_remote_style',)
+
     def __init__(self, group_number, remote_style,
                  brightness_steps=None, hue_steps=None,
                  saturation_steps=None, temperature_steps=None):
@@ -97,7 +116,7 @@ class CommandSetV6(CommandSet):
         :param brightness: The brightness from in decimal percent (0.0-1.0).
         :return: The brightness in byte representation.
         """
-        return math.ceil(brightness * self.MAX_BRIGHTNESS)
+        return ceil(brightness * self.MAX_BRIGHTNESS)
 
     def convert_saturation(self, saturation):
         """
@@ -110,7 +129,7 @@ class CommandSetV6(CommandSet):
         """
 
         saturation_inverted = 1 - saturation
-        return math.ceil(saturation_inverted * self.MAX_SATURATION)
+        return ceil(saturation_inverted * self.MAX_SATURATION)
 
     def convert_temperature(self, temperature):
         """
@@ -119,7 +138,7 @@ class CommandSetV6(CommandSet):
         :param temperature: The temperature from in decimal percent (0.0-1.0).
         :return: The temperature in byte representation.
         """
-        return math.ceil(temperature * self.MAX_TEMPERATURE)
+        return ceil(temperature * self.MAX_TEMPERATURE)
 
     def convert_hue(self, hue, legacy_color_wheel=False):
         """
@@ -128,10 +147,21 @@ class CommandSetV6(CommandSet):
         :param legacy_color_wheel: Whether or not use the old color wheel.
         :return: The hue regarding the LimitlessLED color wheel.
         """
-        hue = math.ceil(hue * self.MAX_HUE)
+        return self.convert_hue_byte(ceil(hue * self.MAX_HUE),
+                                     legacy_color_wheel)
+
+    def convert_hue_byte(self, hue, legacy_color_wheel=False):
+        """
+        Converts a hue already scaled to 0-MAX_HUE to the LimitlessLED
+        color wheel, in integer arithmetic only.
+        :param hue: The hue (0-MAX_HUE).
+        :param legacy_color_wheel: Whether or not use the old color wheel.
+        :return: The hue regarding the LimitlessLED color wheel.
+        """
         if legacy_color_wheel:
-            hue = (176 - hue) % (self.MAX_HUE + 1)
-            hue = (self.MAX_HUE - hue - 0x37) % (self.MAX_HUE + 1)
+            # Mirrored at 176, then mirrored back at MAX_HUE - 0x37,
+            # which comes down to a shift by 24.
+            hue += 24
         else:
             hue += 10  # The color wheel for RGBWW bulbs seems to be shifted
 
@@ -146,9 +176,16 @@ class CommandSetV6(CommandSet):
         :param command_type: Whether the command is for control, link, or unlink
         :return: The complete command.
         """
-
-        return CommandV6(cmd_1, cmd_2, self._remote_style, self._group_number,
-                         select, select_command, command_type)
+        # The cached command keeps its select command, and so its id, alive.
+        commands = self._commands
+        key = (cmd_1, cmd_2, select, id(select_command), command_type)
+        command = commands.get(key)
+        if command is None:
+            command = CommandV6(cmd_1, cmd_2, self._remote_style,
+                                self._group_number, select, select_command,
+                                command_type)
+            commands[key] = command
+        return command
 
 
 class CommandSetBridgeLightV6(CommandSetV6):
@@ -157,6 +194,8 @@ class CommandSetBridgeLightV6(CommandSetV6):
     SUPPORTED_LED_TYPES = [BRIDGE_LED]
     REMOTE_STYLE = 0x00
 
+    __slots__ = ()
+
     def __init__(self, group_number):
         """
         Initializes the command set.
@@ -208,6 +247,8 @@ class CommandSetWhiteV6(CommandSetV6):
     SUPPORTED_LED_TYPES = [WHITE]
     REMOTE_STYLE = 0x01
 
+    __slots__ = ()
+
     def __init__(self, group_number):
         """
         Initializes the command set.
@@ -284,6 +325,8 @@ class CommandSetDimmerV6(CommandSetV6):
     SUPPORTED_LED_TYPES = [DIMMER]
     REMOTE_STYLE = 0x03
 
+    __slots__ = ()
+
     def __init__(self, group_number):
         """
         Initializes the command set.
@@ -340,6 +383,8 @@ class CommandSetRgbwV6(CommandSetV6):
     SUPPORTED_LED_TYPES = [RGBW]
     REMOTE_STYLE = 0x07
 
+    __slots__ = ()
+
     def __init__(self, group_number):
         """
         Initializes the command set.
@@ -411,6 +456,8 @@ class CommandSetWrgbV6(CommandSetV6):
     SUPPORTED_LED_TYPES = [WRGB]
     REMOTE_STYLE = 0x06
 
+    __slots__ = ()
+
     def __init__(self, group_number):
         """
         Initializes the command set.
@@ -538,6 +585,8 @@ class CommandSetRgbwwV6(CommandSetV6):
     SUPPORTED_LED_TYPES = [RGBWW]
     REMOTE_STYLE = 0x08
 
+    __slots__ = ()
+
     def __init__(self, group_number):
         """
         Initializes the command set.
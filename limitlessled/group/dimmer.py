@@ -38,11 +38,12 @@ class DimmerGroup(Group):
 
         :param brightness: Value to set (0.0-1.0).
         """
-        try:
-            cmd = self.command_set.brightness(brightness)
-            self.send(cmd)
+        # One absolute command, if the command set has one.
+        brightness_command = getattr(self.command_set, 'brightness', None)
+        if brightness_command is not None:
+            self.send(brightness_command(brightness))
             self._brightness = brightness
-        except AttributeError:
+        else:
             self._setter('_brightness', brightness,
                          self._dimmest, self._brightest,
                          self._to_brightness)
@@ -76,20 +77,22 @@ class DimmerGroup(Group):
         if brightness is not None:
             b_steps = steps(self.brightness, brightness,
                             self.command_set.brightness_steps)
-        # Compute ideal step amount (at least one).
-        # Calculate wait.
-        wait = self._wait(duration, b_steps, b_steps)
-        # Scale down steps if no wait time.
-        if wait == 0:
+        # Nothing to do if the change is less than a step.
+        if b_steps == 0:
+            return
+        # Scale down steps if there is no time to wait between them.
+        # The waiting itself is done per step by _wait_for_step.
+        if not self._wait(duration, b_steps, b_steps):
             b_steps = self._scale_steps(duration, b_steps,
                                                  b_steps)
         # Perform transition.
+        start = time.monotonic()
+        period = duration / max(b_steps, 1)
         for i in range(b_steps):
             # Brightness.
-            if b_steps > 0:
-                self.brightness = util.transition(i, b_steps,
-                                                  b_start, brightness)
-            time.sleep(wait)
+            value = util.transition(i, b_steps, b_start, brightness)
+            self._step_to('brightness', value)
+            self._wait_for_step(start, i, period)
 
     def _setter(self, attr, value, bottom, top, to_step):
         """ Set a value.
@@ -1,5 +1,6 @@
 """ White LimitlessLED group. """
 
+import math
 import time
 
 from limitlessled import util
@@ -118,25 +119,29 @@ class WhiteGroup(Group):
         # Compute ideal step amount (at least one).
         total_steps = max(b_steps, t_steps, 1)
         total_commands = b_steps + t_steps
-        # Calculate wait.
-        wait = self._wait(duration, total_steps, total_commands)
-        # Scale down steps if no wait time.
-        if wait == 0:
+        # Scale down steps if there is no time to wait between them.
+        # The waiting itself is done per step by _wait_for_step.
+        if not self._wait(duration, total_steps, total_commands):
             b_steps, t_steps = self._scale_steps(duration, total_commands,
                                                  b_steps, t_steps)
             total_steps = max(b_steps, t_steps, 1)
+        # Iterations between two commands of each property.
+        b_every = math.ceil(total_steps / b_steps) if b_steps else 0
+        t_every = math.ceil(total_steps / t_steps) if t_steps else 0
         # Perform transition.
+        start = time.monotonic()
+        period = duration / max(total_steps, 1)
         for i in range(total_steps):
             # Brightness.
-            if b_steps > 0 and i % (total_steps / b_steps) == 0:
-                self.brightness = util.transition(i, total_steps,
-                                                  b_start, brightness)
+            if b_steps > 0 and i % b_every == 0:
+                value = util.transition(i, total_steps, b_start, brightness)
+                self._step_to('brightness', value)
             # Temperature.
-            elif t_steps > 0:
-                self.temperature = util.transition(i, total_steps,
-                                                   t_start, temperature)
+            if t_steps > 0 and i % t_every == 0:
+                value = util.transition(i, total_steps, t_start, temperature)
+                self._step_to('temperature', value)
             # Wait.
-            time.sleep(wait)
+            self._wait_for_step(start, i, period)
 
     def _setter(self, attr, value, bottom, top, to_step):
         """ Set a value.
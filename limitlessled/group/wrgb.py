@@ -3,13 +3,12 @@
 import math
 import time
 
-from limitlessled import Color, util
+from limitlessled import RGB_WHITE, util
 from limitlessled.group import Group, rate
 from limitlessled.util import steps, hue_of_color
 
 
 WRGB = 'wrgb'
-RGB_WHITE = Color(255, 255, 255)
 
 
 class WrgbGroup(Group):
@@ -199,28 +198,33 @@ class WrgbGroup(Group):
         # Calculate hue steps.
         h_steps = 0
         if hue is not None:
-            h_steps = steps(self.hue,
-                            hue, self.command_set.hue_steps)
             h_start = self.hue
+            # Take the shorter way around the color wheel.
+            hue = util.hue_path(h_start, hue)
+            h_steps = int(abs(hue - h_start) * self.command_set.hue_steps)
         # Compute ideal step amount (at least one).
         total_steps = max(b_steps, h_steps, 1)
         total_commands = b_steps + h_steps
-        # Calculate wait.
-        wait = self._wait(duration, total_steps, total_commands)
-        # Scale down steps if no wait time.
-        if wait == 0:
+        # Scale down steps if there is no time to wait between them.
+        # The waiting itself is done per step by _wait_for_step.
+        if not self._wait(duration, total_steps, total_commands):
             b_steps, h_steps = self._scale_steps(duration, total_commands,
                                                  b_steps, h_steps)
             total_steps = max(b_steps, h_steps, 1)
+        # Iterations between two commands of each property.
+        b_every = math.ceil(total_steps / b_steps) if b_steps else 0
+        h_every = math.ceil(total_steps / h_steps) if h_steps else 0
         # Perform transition.
+        start = time.monotonic()
+        period = duration / max(total_steps, 1)
         for i in range(total_steps):
             # Brightness.
-            if b_steps > 0 and i % math.ceil(total_steps/b_steps) == 0:
-                self.brightness = util.transition(i, total_steps,
-                                                  b_start, brightness)
+            if b_steps > 0 and i % b_every == 0:
+                value = util.transition(i, total_steps, b_start, brightness)
+                self._step_to('brightness', value)
             # Hue.
-            if h_steps > 0 and i % math.ceil(total_steps/h_steps) == 0:
-                self.hue = util.transition(i, total_steps,
-                                           h_start, hue)
+            if h_steps > 0 and i % h_every == 0:
+                value = util.transition(i, total_steps, h_start, hue) % 1.0
+                self._step_to('hue', value)
             # Wait.
-            time.sleep(wait)
+            self._wait_for_step(start, i, period)
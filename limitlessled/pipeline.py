@@ -3,6 +3,7 @@
 import logging
 import threading
 import time
+from functools import partial
 
 from limitlessled import Color
 
@@ -12,15 +13,17 @@ _LOGGER = logging.getLogger(__name__)
 class PipelineQueue(threading.Thread):
     """ Pipeline queue. """
 
-    def __init__(self, queue, event):
+    def __init__(self, queue, event, queued):
         """ Initialize pipeline queue.
 
-        :param queue: Read from this queue.
+        :param queue: Read from this deque.
         :param event: Read from this event.
+        :param queued: Event set when a pipeline is added to the queue.
         """
         super(PipelineQueue, self).__init__()
         self._queue = queue
         self._event = event
+        self._queued = queued
 
     def run(self):
         """ Run the pipeline queue.
@@ -28,13 +31,22 @@ class PipelineQueue(threading.Thread):
         The pipeline queue will run forever.
         """
         while True:
+            try:
+                pipeline = self._queue.popleft()
+            except IndexError:
+                self._queued.wait()
+                # Clear before looking again, so no pipeline is missed.
+                self._queued.clear()
+                continue
             self._event.clear()
-            self._queue.get().run(self._event)
+            pipeline.run(self._event)
 
 
 class Stage(object):
     """ Stage. """
 
+    __slots__ = ('name', 'args', 'kwargs')
+
     def __init__(self, name, args, kwargs):
         """ Initialize stage.
 
@@ -70,18 +82,12 @@ class Pipeline(object):
     def __init__(self):
         """ Initialize pipeline.
 
-        Stage methods are dynamically initialized
-        since they all follow the same pattern.
+        Stage methods are added to the class
+        once, when the module is imported.
         """
         self._pipe = []
+        self._steps = []
         self._group = None
-        stages = ['on', 'off', 'color', 'transition', 'flash', 'callback',
-                  'repeat', 'brightness', 'wait', 'temperature', 'white',
-                  'white_up', 'white_down', 'red_up', 'red_down',
-                  'green_up', 'green_down', 'blue_up', 'blue_down',
-                  'night_light', 'link', 'unlink']
-        for name in stages:
-            self._add_stage(name)
 
     @property
     def pipe(self):
@@ -107,11 +113,14 @@ class Pipeline(object):
         :param stop: Stop event
         """
         _LOGGER.info("Starting a new pipeline on group %s", self._group)
+        self._steps = [None] * len(self._pipe)
         self._group.bridge.incr_active()
-        for i, stage in enumerate(self._pipe):
-            self._execute_stage(i, stage, stop)
+        try:
+            for index in range(len(self._pipe)):
+                self._execute_stage(index, stop)
+        finally:
+            self._group.bridge.decr_active()
         _LOGGER.info("Finished pipeline on group %s", self._group)
-        self._group.bridge.decr_active()
 
     def append(self, pipeline):
         """ Append a pipeline to this pipeline.
@@ -123,83 +132,60 @@ class Pipeline(object):
             self._pipe.append(stage)
         return self
 
-    def _add_stage(self, name):
-        """ Add stage methods at runtime.
-
-        Stage methods all follow the same pattern.
-
-        :param name: Stage name.
-        """
-        def stage_func(self, *args, **kwargs):
-            """ Stage function.
-
-            :param args: Positional arguments.
-            :param kwargs: Keyword arguments.
-            :return: Pipeline (for method chaining).
-            """
-            self._pipe.append(Stage(name, args, kwargs))
-            return self
+    def _compile_stage(self, index, stage, stop):
+        """ Resolve a pipeline stage to a call on the group.
 
-        setattr(Pipeline, name, stage_func)
-
-    def _execute_stage(self, index, stage, stop):
-        """ Execute a pipeline stage.
+        Stages are resolved when they first run, so repeated
+        stages skip the lookup.
 
         :param index: Stage index.
         :param stage: Stage object.
+        :param stop: Stop event.
+        :returns: Function without arguments.
         """
-        if stop.is_set():
-            _LOGGER.info("Stopped pipeline on group %s", self._group)
-            return
-        _LOGGER.info(" -> Running stage '%s' on group %s", stage, self._group)
+        group = self._group
         if stage.name == 'on':
-            self._group.on = True
+            return partial(setattr, group, 'on', True)
         elif stage.name == 'off':
-            self._group.on = False
-        elif stage.name == 'hue':
-            self._group.hue = stage.args[0]
-        elif stage.name == 'saturation':
-            self._group.saturation = stage.args[0]
+            return partial(setattr, group, 'on', False)
         elif stage.name == 'color':
-            self._group.color = Color(*stage.args)
-        elif stage.name == 'brightness':
-            self._group.brightness = stage.args[0]
-        elif stage.name == 'temperature':
-            self._group.temperature = stage.args[0]
+            return partial(setattr, group, 'color', Color(*stage.args))
+        elif stage.name in ['hue', 'saturation', 'brightness', 'temperature']:
+            return partial(setattr, group, stage.name, stage.args[0])
         elif stage.name == 'transition':
-            self._group.transition(*stage.args, **stage.kwargs)
-        elif stage.name == 'white':
-            self._group.white()
-        elif stage.name == 'white_up':
-            self._group.white_up()
-        elif stage.name == 'white_down':
-            self._group.white_down()
-        elif stage.name == 'red_up':
-            self._group.red_up()
-        elif stage.name == 'red_down':
-            self._group.red_down()
-        elif stage.name == 'green_up':
-            self._group.green_up()
-        elif stage.name == 'green_down':
-            self._group.green_down()
-        elif stage.name == 'blue_up':
-            self._group.blue_up()
-        elif stage.name == 'blue_down':
-            self._group.blue_down()
-        elif stage.name == 'night_light':
-            self._group.night_light()
-        elif stage.name == 'link':
-            self._group.link()
-        elif stage.name == 'unlink':
-            self._group.unlink()
+            return partial(group.transition, *stage.args, **stage.kwargs)
         elif stage.name == 'flash':
-            self._group.flash(**stage.kwargs)
+            return partial(group.flash, **stage.kwargs)
+        elif stage.name in ['white', 'white_up', 'white_down',
+                            'red_up', 'red_down', 'green_up', 'green_down',
+                            'blue_up', 'blue_down', 'night_light',
+                            'link', 'unlink']:
+            return getattr(group, stage.name)
         elif stage.name == 'repeat':
-            self._repeat(index, stage, stop)
+            return partial(self._repeat, index, stage, stop)
         elif stage.name == 'wait':
-            time.sleep(*stage.args)
+            return partial(time.sleep, *stage.args)
         elif stage.name == 'callback':
-            stage.args[0](*stage.args[1:], **stage.kwargs)
+            return partial(stage.args[0], *stage.args[1:], **stage.kwargs)
+        raise ValueError("Unknown stage: {}".format(stage.name))
+
+    def _execute_stage(self, index, stop):
+        """ Execute a pipeline stage.
+
+        :param index: Stage index.
+        :param stop: Stop event.
+        """
+        if stop.is_set():
+            _LOGGER.info("Stopped pipeline on group %s", self._group)
+            return
+        stage = self._pipe[index]
+        _LOGGER.info(" -> Running stage '%s' on group %s", stage, self._group)
+        step = self._steps[index]
+        if step is None:
+            # A bad stage only fails once the pipeline gets to it.
+            step = self._compile_stage(index, stage, stop)
+            self._steps[index] = step
+        step()
 
     def _repeat(self, index, stage, stop):
         """ Repeat a stage.
@@ -223,5 +209,33 @@ class Pipeline(object):
                 if stop.is_set():
                     break
                 stage_index = index - stages_back + forward
-                self._execute_stage(stage_index, self._pipe[stage_index], stop)
+                self._execute_stage(stage_index, stop)
             i += 1
+
+
+def _add_stage(name):
+    """ Add a stage method to the pipeline.
+
+    Stage methods all follow the same pattern.
+
+    :param name: Stage name.
+    """
+    def stage_func(self, *args, **kwargs):
+        """ Stage function.
+
+        :param args: Positional arguments.
+        :param kwargs: Keyword arguments.
+        :return: Pipeline (for method chaining).
+        """
+        self._pipe.append(Stage(name, args, kwargs))
+        return self
+
+    setattr(Pipeline, name, stage_func)
+
+
+for _name in ['on', 'off', 'color', 'transition', 'flash', 'callback',
+              'repeat', 'brightness', 'wait', 'temperature', 'white',
+              'white_up', 'white_down', 'red_up', 'red_down',
+              'green_up', 'green_down', 'blue_up', 'blue_down',
+              'night_light', 'link', 'unlink']:
+    _add_stage(_name)
@@ -11,7 +11,23 @@ def hue_of_color(color):
     :param color: The RGB color tuple.
     :return: The hue of the color (0.0-1.0).
     """
-    return rgb_to_hsv(*[x / 255 for x in color])[0]
+    # The hue part of colorsys.rgb_to_hsv, with the same float
+    # arithmetic, so the hue bytes sent are unchanged.
+    red, green, blue = [x / 255 for x in color]
+    maximum = max(red, green, blue)
+    delta = maximum - min(red, green, blue)
+    if delta == 0:
+        return 0.0
+    red_distance = (maximum - red) / delta
+    green_distance = (maximum - green) / delta
+    blue_distance = (maximum - blue) / delta
+    if red == maximum:
+        hue = blue_distance - green_distance
+    elif green == maximum:
+        hue = 2.0 + red_distance - blue_distance
+    else:
+        hue = 4.0 + green_distance - red_distance
+    return (hue / 6.0) % 1.0
 
 
 def saturation_of_color(color):
@@ -57,3 +73,18 @@ def steps(current, target, max_steps):
     if target < 0 or target > 1.0:
         raise ValueError("target value %s is out of bounds (0.0-1.0)", target)
     return int(abs((current * max_steps) - (target * max_steps)))
+
+
+def hue_path(current, target):
+    """ Target hue along the shorter way around the color wheel.
+
+    :param current: Current hue (0.0-1.0).
+    :param target: Target hue (0.0-1.0).
+    :returns: Target hue, a full turn off if that is closer (-0.5-1.5).
+    """
+    if target < 0 or target > 1.0:
+        raise ValueError("target value %s is out of bounds (0.0-1.0)", target)
+    delta = (target - current) % 1.0
+    if delta > 0.5:
+        delta -= 1.0
+    return current + delta
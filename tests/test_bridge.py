@@ -1,4 +1,8 @@
+import select
+import socket
+import time
 import unittest
+from collections import deque
 from limitlessled.bridge import Bridge, group_factory
 from limitlessled.group.white import WhiteGroup, WHITE
 from limitlessled.group.rgbw import RgbwGroup, RGBW, BRIDGE_LED
@@ -15,6 +19,12 @@ class TestGroupFactory(unittest.TestCase):
         self.assertTrue(isinstance(rgbw_group, RgbwGroup))
         bridge.close()
 
+    def test_bad_group_factory(self):
+        bridge = Bridge('localhost', 9999, version=5)
+        with self.assertRaises(ValueError):
+            group_factory(bridge, 1, 'test', 'bad')
+        bridge.close()
+
 
 class TestLegacyBridge(unittest.TestCase):
 
@@ -28,3 +38,123 @@ class TestLegacyBridge(unittest.TestCase):
     def tearDown(self):
         self.bridge.close()
         self.assertTrue(self.bridge.is_closed)
+
+
+class TestLegacyBridgeSend(unittest.TestCase):
+
+    def setUp(self):
+        self.server = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.server.bind(('127.0.0.1', 0))
+        self.server.settimeout(1)
+        self.bridge = Bridge('127.0.0.1', self.server.getsockname()[1], version=5)
+        self.group = self.bridge.add_group(1, 'test', WHITE)
+
+    def test_send_raw_batch(self):
+        command = self.group.command_set.on()
+        self.assertEqual(self.bridge._send_raw_batch(command, 3), 3)
+        for _ in range(3):
+            self.assertEqual(self.server.recv(16), b'\x38\x00')
+
+    def test_receive_keep_alive_response(self):
+        self.bridge._keep_alive_deadline = 1
+        address = self.bridge._socket.getsockname()
+        self.server.sendto(b'\x88\x00\x00\x00\x03\x00\x01\x00', address)
+        time.sleep(0.05)
+        self.bridge._receive()
+        self.assertEqual(self.bridge._keep_alive_deadline, 1)
+        self.server.sendto(b'\xd8\x00\x00\x00\x07' + bytes(7), address)
+        time.sleep(0.05)
+        self.bridge._receive()
+        self.assertIsNone(self.bridge._keep_alive_deadline)
+
+    def test_receive_ignores_stale_buffer(self):
+        self.bridge._keep_alive_response[:5] = b'\xd8\x00\x00\x00\x07'
+        self.bridge._keep_alive_deadline = 1
+        self.server.sendto(b'\xd8', self.bridge._socket.getsockname())
+        time.sleep(0.05)
+        self.bridge._receive()
+        self.assertEqual(self.bridge._keep_alive_deadline, 1)
+
+    def test_init_connection_skips_other_responses(self):
+        address = self.bridge._socket.getsockname()
+        response = bytearray(22)
+        response[19:21] = b'\xab\xcd'
+        self.server.sendto(b'\x88\x00\x00\x00\x03\x00\x01\x00', address)
+        self.server.sendto(response, address)
+        time.sleep(0.05)
+        self.assertTrue(self.bridge._init_connection())
+        self.assertEqual((self.bridge.wb1, self.bridge.wb2), (0xab, 0xcd))
+
+    def tearDown(self):
+        self.bridge.close()
+        self.server.close()
+
+
+class InterleavingSocket(object):
+
+    def __init__(self, sock, before_recv):
+        self.sock = sock
+        self.before_recv = before_recv
+
+    def recv(self, size):
+        if self.before_recv is not None:
+            before_recv, self.before_recv = self.before_recv, None
+            before_recv()
+        return self.sock.recv(size)
+
+
+class TestWakeUp(unittest.TestCase):
+
+    def setUp(self):
+        # Without a consumer thread, to control the interleaving.
+        self.bridge = Bridge.__new__(Bridge)
+        self.bridge._command_queue = deque()
+        self.wake_r, self.bridge._wake_w = socket.socketpair()
+        self.wake_r.setblocking(False)
+        self.bridge._wake_r = self.wake_r
+        self.bridge._wake_pending = False
+
+    def is_woken(self):
+        return bool(select.select([self.wake_r], [], [], 0)[0])
+
+    def test_enqueue_wakes_once(self):
+        self.bridge._enqueue(1)
+        self.bridge._enqueue(2)
+        self.assertEqual(self.wake_r.recv(64), b'\x01')
+        self.assertEqual(list(self.bridge._command_queue), [1, 2])
+
+    def test_enqueue_while_draining(self):
+        self.bridge._enqueue(1)
+        # A producer enqueues while the consumer drains the wake up bytes.
+        self.bridge._wake_r = InterleavingSocket(
+            self.wake_r, lambda: self.bridge._enqueue(2))
+        self.bridge._drain_wake()
+        self.bridge._command_queue.clear()
+        # The next command must wake the consumer again.
+        self.bridge._enqueue(3)
+        self.assertTrue(self.is_woken())
+
+    def tearDown(self):
+        self.wake_r.close()
+        self.bridge._wake_w.close()
+
+
+class TestLegacyBridgeQueue(unittest.TestCase):
+
+    def setUp(self):
+        self.server = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.server.bind(('127.0.0.1', 0))
+        self.server.settimeout(1)
+        self.bridge = Bridge('127.0.0.1', self.server.getsockname()[1], version=5)
+        self.group = self.bridge.add_group(1, 'test', WHITE)
+
+    def test_send(self):
+        commands = [self.group.command_set.on(), self.group.command_set.off()] * 5
+        for command in commands:
+            self.bridge.send(command, reps=1, wait=0)
+        for command in commands:
+            self.assertEqual(self.server.recv(16), command.get_bytes(self.bridge))
+
+    def tearDown(self):
+        self.bridge.close()
+        self.server.close()
@@ -4,6 +4,7 @@ from limitlessled.group.white import WHITE
 from limitlessled.group.rgbw import RGBW
 from limitlessled.group.commands import Command, CommandSet, command_set_factory
 from limitlessled.group.commands.legacy import CommandSetWhiteLegacy, CommandSetRgbwLegacy
+from limitlessled.group.commands.v6 import CommandV6, CommandSetRgbwV6
 
 
 class TestLegacyCommandSetFactory(unittest.TestCase):
@@ -21,6 +22,9 @@ class TestLegacyCommandSetFactory(unittest.TestCase):
         with self.assertRaises(ValueError):
             command_set_factory(self.bridge, 1, 'bad')
 
+    def tearDown(self):
+        self.bridge.close()
+
 
 class TestCommand(unittest.TestCase):
 
@@ -42,6 +46,66 @@ class TestCommand(unittest.TestCase):
     def test_select_command(self):
         self.assertEqual(self.command.select_command, None)
 
+    def test_select_group(self):
+        self.assertEqual(self.command.select_group, 1)
+        self.assertIsNone(Command(b'\x00', b'\x01', 1).select_group)
+
+
+class ReadyBridge:
+
+    is_ready = True
+    wb1 = 0xAB
+    wb2 = 0xCD
+    sn = 0x07
+
+
+class TestCommandV6(unittest.TestCase):
+
+    def setUp(self):
+        self.command = CommandV6(0x03, 0x01, 0x07, 2)
+
+    def test_get_bytes(self):
+        self.assertEqual(self.command.get_bytes(ReadyBridge()), bytearray([
+            0x80, 0x00, 0x00, 0x00, 0x11, 0xAB, 0xCD, 0x00, 0x07, 0x00,
+            0x31, 0x00, 0x00, 0x07, 0x03, 0x01, 0x01, 0x01, 0x01,
+            0x02, 0x00, 0x41]))
+
+    def test_checksum(self):
+        for command_type in [CommandV6.TYPE_CONTROL, CommandV6.TYPE_LINK]:
+            for cmd_2 in range(256):
+                packet = CommandV6(0x05, cmd_2, 0x08, 4, command_type=command_type) \
+                    .get_bytes(ReadyBridge())
+                self.assertEqual(packet[21], sum(packet[10:21]) & 0xFF)
+
+    def test_get_bytes_is_a_copy(self):
+        bridge = ReadyBridge()
+        packet = self.command.get_bytes(bridge)
+        packet[CommandV6.SN_INDEX] = 0xFF
+        self.assertEqual(self.command.get_bytes(bridge)[CommandV6.SN_INDEX], 0x07)
+
+
+class TestCommandSetV6(unittest.TestCase):
+
+    def setUp(self):
+        self.commands = CommandSetRgbwV6(1)
+
+    def test_convert_hue(self):
+        self.assertEqual(self.commands.convert_hue(0), 10)
+        self.assertEqual(self.commands.convert_hue(1.0), 9)
+        self.assertEqual(self.commands.convert_hue(0, True), 24)
+        self.assertEqual(self.commands.convert_hue(0.5, True), 152)
+        self.assertEqual(self.commands.convert_hue(1.0, True), 23)
+
+    def test_convert_hue_byte(self):
+        self.assertEqual(self.commands.convert_hue_byte(0), 10)
+        self.assertEqual(self.commands.convert_hue_byte(250), 4)
+        self.assertEqual(self.commands.convert_hue_byte(128, True), 152)
+
+    def test_commands_are_cached(self):
+        self.assertIs(self.commands.on(), self.commands.on())
+        self.assertIs(self.commands.brightness(0.5), self.commands.brightness(0.5))
+        self.assertIsNot(self.commands.brightness(0.5), self.commands.brightness(0.6))
+
 
 class TestCommandSet(unittest.TestCase):
 
@@ -1,5 +1,7 @@
+import time
 import unittest
 from limitlessled.bridge import Bridge
+from limitlessled.group import Group, rate
 from limitlessled.group.white import WhiteGroup, WHITE
 from limitlessled.group.rgbw import RgbwGroup, RGBW
 from limitlessled.group.rgbww import RgbwwGroup, RGBWW
@@ -22,3 +24,54 @@ class TestWhiteGroup(unittest.TestCase):
 
     def tearDown(self):
         self.bridge.close()
+
+
+class TestGroupTiming(unittest.TestCase):
+
+    def setUp(self):
+        self.bridge = Bridge('localhost', 9999, version=5)
+        self.group = Group(self.bridge, 1, 'test', WHITE)
+        self.group.wait = 0.1
+        self.group.reps = 2
+
+    def test_wait(self):
+        self.bridge.active = 1
+        self.assertAlmostEqual(self.group._wait(2.0, 5, 5), 0.0)
+        self.assertAlmostEqual(self.group._wait(4.0, 5, 5), 0.4)
+        self.assertEqual(self.group._wait(1.0, 5, 5), 0)
+
+    def test_scale_steps(self):
+        self.bridge.active = 1
+        self.assertEqual(self.group._scale_steps(1.0, 11, 10), 5)
+        self.assertEqual(self.group._scale_steps(1.0, 11, 10, 3), [5, 2])
+        # 2.1 / 2.8 * 4 is exactly 3, floats land just above it.
+        self.assertEqual(self.group._scale_steps(2.1, 15, 4), 3)
+
+    def test_wait_for_step(self):
+        start = time.monotonic()
+        self.group._wait_for_step(start, 1, 0.05)
+        self.assertGreaterEqual(time.monotonic() - start, 0.1)
+        # A step that is already late does not wait at all.
+        before = time.monotonic()
+        self.group._wait_for_step(start - 10, 0, 0.05)
+        self.assertLess(time.monotonic() - before, 0.05)
+
+    def test_step_to(self):
+        sent = []
+        self.group.send = sent.append
+        self.group._step_to('on', False)
+        self.assertEqual(sent, [])
+        self.group._step_to('on', True)
+        self.assertEqual(sent, [self.group.command_set.on()])
+
+    def test_rate_restores_on_error(self):
+        @rate(wait=0.5, reps=7)
+        def fail(group):
+            self.assertEqual((group.wait, group.reps), (0.5, 7))
+            raise RuntimeError
+        with self.assertRaises(RuntimeError):
+            fail(self.group)
+        self.assertEqual((self.group.wait, self.group.reps), (0.1, 2))
+
+    def tearDown(self):
+        self.bridge.close()
@@ -18,6 +18,22 @@ class TestLegacyCommands(unittest.TestCase):
         self.assertEqual(CommandSetLegacy.convert_hue(1.0), 170)
 
 
+class VersionBridge:
+
+    def __init__(self, version):
+        self.version = version
+
+
+class TestCommandLegacy(unittest.TestCase):
+
+    def test_get_bytes(self):
+        self.assertEqual(CommandLegacy(0x38, None, 1).get_bytes(VersionBridge(5)), b'\x38\x00')
+        self.assertEqual(CommandLegacy(0x4e, 0x10, 1).get_bytes(VersionBridge(5)), b'\x4e\x10')
+
+    def test_get_bytes_long(self):
+        self.assertEqual(CommandLegacy(0x38, None, 1).get_bytes(VersionBridge(2)), b'\x38\x00\x55')
+
+
 class TestWhiteLegacyCommands(unittest.TestCase):
 
     def setUp(self):
@@ -26,6 +42,10 @@ class TestWhiteLegacyCommands(unittest.TestCase):
     def test_on(self):
         self.assertEqual(self.commands.on(), CommandLegacy(0x38, None, 1))
 
+    def test_commands_are_cached(self):
+        self.assertIs(self.commands.on(), self.commands.on())
+        self.assertIs(self.commands.dimmer().select_command, self.commands.on())
+
     def test_off(self):
         self.assertEqual(self.commands.off(), CommandLegacy(0x3b, None, 1))
 
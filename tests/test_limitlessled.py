@@ -17,3 +17,6 @@ class TestLegacyLimitlessLED(unittest.TestCase):
     def test_group(self):
         self.ll.add_bridge(self.bridge)
         self.assertEqual(self.ll.group('test'), self.group)
+
+    def tearDown(self):
+        self.bridge.close()
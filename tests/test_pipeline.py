@@ -0,0 +1,136 @@
+import threading
+import unittest
+from collections import deque
+from limitlessled import Color
+from limitlessled.pipeline import Pipeline, PipelineQueue, Stage
+
+
+class RecordingBridge(object):
+
+    def __init__(self):
+        self.active = 0
+
+    def incr_active(self):
+        self.active += 1
+
+    def decr_active(self):
+        self.active -= 1
+
+
+class RecordingGroup(object):
+
+    def __init__(self):
+        self.bridge = RecordingBridge()
+        self.calls = []
+
+    def __setattr__(self, name, value):
+        if name in ['on', 'color', 'brightness', 'temperature']:
+            self.calls.append((name, value))
+        super().__setattr__(name, value)
+
+    def transition(self, *args, **kwargs):
+        self.calls.append(('transition', args, kwargs))
+
+    def flash(self, *args, **kwargs):
+        self.calls.append(('flash', args, kwargs))
+
+    def white(self):
+        self.calls.append(('white',))
+
+
+class TestStage(unittest.TestCase):
+
+    def test_str(self):
+        self.assertEqual(str(Stage('repeat', (), {'stages': 2})),
+                         'repeat(stages=2)')
+        self.assertEqual(str(Stage('color', (255, 0, 0), {})),
+                         'color(255, 0, 0)')
+
+
+class TestPipeline(unittest.TestCase):
+
+    def setUp(self):
+        self.group = RecordingGroup()
+        self.stop = threading.Event()
+
+    def run_pipeline(self, pipeline):
+        pipeline.group = self.group
+        pipeline.run(self.stop)
+        return self.group.calls
+
+    def test_stages(self):
+        pipeline = Pipeline() \
+            .on() \
+            .brightness(0.7) \
+            .color(0, 0, 255) \
+            .transition(1, color=Color(255, 0, 0)) \
+            .white() \
+            .off()
+        self.assertEqual(self.run_pipeline(pipeline), [
+            ('on', True),
+            ('brightness', 0.7),
+            ('color', Color(0, 0, 255)),
+            ('transition', (1,), {'color': Color(255, 0, 0)}),
+            ('white',),
+            ('on', False)])
+        self.assertEqual(self.group.bridge.active, 0)
+
+    def test_repeat(self):
+        pipeline = Pipeline().on().off().repeat(stages=2, iterations=3)
+        self.assertEqual(self.run_pipeline(pipeline),
+                         [('on', True), ('on', False)] * 3)
+
+    def test_callback(self):
+        calls = []
+        pipeline = Pipeline().callback(calls.append, 1)
+        self.run_pipeline(pipeline)
+        self.assertEqual(calls, [1])
+
+    def test_flash(self):
+        pipeline = Pipeline().flash(duration=0.5)
+        self.assertEqual(self.run_pipeline(pipeline),
+                         [('flash', (), {'duration': 0.5})])
+
+    def test_unknown_stage(self):
+        pipeline = Pipeline().on()
+        pipeline.pipe.append(Stage('bogus', (), {}))
+        with self.assertRaises(ValueError):
+            self.run_pipeline(pipeline)
+        self.assertEqual(self.group.bridge.active, 0)
+
+    def test_stop(self):
+        self.stop.set()
+        self.assertEqual(self.run_pipeline(Pipeline().on().off()), [])
+
+    def test_stop_before_bad_stage(self):
+        pipeline = Pipeline().on().callback(self.stop.set).color('bad')
+        self.assertEqual(self.run_pipeline(pipeline), [('on', True)])
+
+    def test_error_restores_active(self):
+        pipeline = Pipeline().on().white_up()
+        with self.assertRaises(AttributeError):
+            self.run_pipeline(pipeline)
+        self.assertEqual(self.group.calls, [('on', True)])
+        self.assertEqual(self.group.bridge.active, 0)
+
+    def test_append(self):
+        pipeline = Pipeline().on().append(Pipeline().off())
+        self.assertEqual([stage.name for stage in pipeline.pipe], ['on', 'off'])
+
+
+class TestPipelineQueue(unittest.TestCase):
+
+    def test_run(self):
+        group = RecordingGroup()
+        queue = deque()
+        queued = threading.Event()
+        done = threading.Event()
+        thread = PipelineQueue(queue, threading.Event(), queued)
+        thread.daemon = True
+        thread.start()
+        for pipeline in [Pipeline().on(), Pipeline().white().callback(done.set)]:
+            pipeline.group = group
+            queue.append(pipeline)
+            queued.set()
+        self.assertTrue(done.wait(5))
+        self.assertEqual(group.calls, [('on', True), ('white',)])
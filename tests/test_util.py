@@ -1,5 +1,7 @@
 import unittest
+from colorsys import rgb_to_hsv
 from limitlessled import util, Color
+from limitlessled.group.commands.v6 import CommandSetRgbwV6
 
 
 class TestUtil(unittest.TestCase):
@@ -7,6 +9,27 @@ class TestUtil(unittest.TestCase):
     def test_hue_of_color(self):
         red = Color(255, 0, 0)
         self.assertEqual(util.hue_of_color(red), 0.0)
+        self.assertAlmostEqual(util.hue_of_color(Color(0, 255, 0)), 1 / 3)
+        self.assertAlmostEqual(util.hue_of_color(Color(0, 0, 255)), 2 / 3)
+        self.assertAlmostEqual(util.hue_of_color(Color(255, 0, 255)), 5 / 6)
+        self.assertEqual(util.hue_of_color(Color(128, 128, 128)), 0.0)
+
+    def test_hue_of_color_bytes(self):
+        command_set = CommandSetRgbwV6(1)
+        for color, hue_byte in [(Color(0, 42, 255), 187),
+                                (Color(0, 51, 48), 149),
+                                (Color(0, 234, 255), 155)]:
+            hue = util.hue_of_color(color)
+            self.assertEqual(command_set.convert_hue(hue, True), hue_byte)
+
+    def test_hue_of_color_matches_colorsys(self):
+        values = range(0, 256, 15)
+        for red in values:
+            for green in values:
+                for blue in values:
+                    expected = rgb_to_hsv(red / 255, green / 255, blue / 255)[0]
+                    self.assertEqual(util.hue_of_color(Color(red, green, blue)),
+                                     expected)
 
     def test_saturation_of_color(self):
         red = Color(255, 0, 0)
@@ -31,3 +54,10 @@ class TestUtil(unittest.TestCase):
             util.steps(-1, 1.0, 100)
         with self.assertRaises(ValueError):
             util.steps(0, 2.0, 100)
+
+    def test_hue_path(self):
+        self.assertAlmostEqual(util.hue_path(0.25, 0.5), 0.5)
+        self.assertAlmostEqual(util.hue_path(0.9, 0.1), 1.1)
+        self.assertAlmostEqual(util.hue_path(0.1, 0.9), -0.1)
+        with self.assertRaises(ValueError):
+            util.hue_path(0.5, 2.0)